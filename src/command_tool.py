@@ -1,6 +1,6 @@
 import shlex  # 导入shlex库，用于正确解析命令行输入
 
-from config import Config  # 从config模块导入Config类，用于配置管理
+from config import get_config  # 从config模块导入get_config，获取共享的配置实例
 from github_client import GitHubClient  # 从github_client模块导入GitHubClient类，用于GitHub API操作
 from report_generator import ReportGenerator  # 从report_generator模块导入ReportGenerator类，用于报告生成
 from llm import LLM  # 从llm模块导入LLM类，可能用于语言模型相关操作
@@ -9,7 +9,7 @@ from command_handler import CommandHandler  # 从command_handler模块导入Comm
 from logger import LOG  # 从logger模块导入LOG对象，用于日志记录
 
 def main():
-    config = Config()  # 创建配置实例
+    config = get_config()  # 获取配置实例
     github_client = GitHubClient(config.github_token)  # 创建GitHub客户端实例
     llm = LLM(config)  # 创建语言模型实例
     report_generator = ReportGenerator(llm, config.report_types)  # 创建报告生成器实例
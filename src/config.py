@@ -1,6 +1,125 @@
-import json
 import os
-from dotenv import load_dotenv
+from functools import lru_cache
+from pathlib import Path
+from types import MappingProxyType
+from typing import List, Optional
+
+from pydantic import BaseModel, ConfigDict, field_validator
+
+CONFIG_FILE = 'config.json'
+
+# .env 只需在进程内加载一次
+_DOTENV_LOADED = False
+
+# 加载 .env 之后的环境变量快照，配置项从这里读取而不是每次访问 os.environ
+_ENV_SNAPSHOT = MappingProxyType({})
+
+# 已校验的配置文件内容，按 (路径, 修改时间) 缓存，文件变化后自动重新解析
+_PARSED_CACHE = {}
+
+
+class _Section(BaseModel):
+    # 配置段校验后不可修改，可在多个 Config 实例之间安全共享；未声明的字段原样保留
+    model_config = ConfigDict(frozen=True, extra='allow')
+
+
+class EmailConfig(_Section):
+    smtp_server: Optional[str] = None
+    smtp_port: Optional[int] = None
+    password: str = ''
+
+
+class GitHubConfig(_Section):
+    token: Optional[str] = None
+    subscriptions_file: Optional[str] = None
+    progress_frequency_days: int = 1
+    progress_execution_time: str = "08:00"
+
+
+class AzureConfig(_Section):
+    base_url: Optional[str] = None
+    deployment_name: Optional[str] = None
+    api_key: Optional[str] = None
+    api_version: Optional[str] = None
+
+
+class LLMConfig(_Section):
+    model_type: str = 'openai'
+    openai_model_name: str = 'gpt-4o-mini'
+    ollama_model_name: str = 'llama3'
+    ollama_api_url: str = 'http://localhost:11434/api/chat'
+    ollama_timeout: float = 60
+    ollama_num_ctx: int = 8192
+    max_tokens: int = 4000
+    openai_timeout: float = 30
+    openai_max_retries: int = 3
+    context_limit: Optional[int] = None
+    cache_enabled: bool = True
+    cache_dir: str = '.cache/llm'
+    # Azure / Azure Foundry settings (support both nested `azure` block or flat keys)
+    azure: AzureConfig = AzureConfig()
+    azure_base_url: Optional[str] = None
+    azure_deployment_name: Optional[str] = None
+    azure_api_key: Optional[str] = None
+    azure_api_version: Optional[str] = None
+
+    @field_validator('azure', mode='before')
+    @classmethod
+    def _azure_block_or_empty(cls, value):
+        # 只使用扁平 azure_* 键时，`azure` 可能为 null 或其他非对象值，按空块处理
+        return value if isinstance(value, dict) else {}
+
+
+class SlackConfig(_Section):
+    webhook_url: Optional[str] = None
+
+
+class ConfigModel(_Section):
+    """
+    config.json 的结构定义，解析时一次性完成类型校验并填充默认值。
+    """
+    email: EmailConfig = EmailConfig()
+    github: GitHubConfig = GitHubConfig()
+    llm: LLMConfig = LLMConfig()
+    report_types: List[str] = ["github", "hacker_news"]  # 默认报告类型
+    slack: SlackConfig = SlackConfig()
+
+
+def _load_env_once():
+    """
+    加载 .env 并对环境变量做一次快照，之后的调用直接返回该快照。
+    """
+    global _DOTENV_LOADED, _ENV_SNAPSHOT
+    if not _DOTENV_LOADED:
+        from dotenv import load_dotenv
+        load_dotenv()
+        _ENV_SNAPSHOT = MappingProxyType(dict(os.environ))
+        _DOTENV_LOADED = True
+    return _ENV_SNAPSHOT
+
+
+def _read_config_file(path):
+    """
+    读取并校验配置文件，相同路径且未修改的文件直接复用上次的结果。
+
+    :raises pydantic.ValidationError: 配置内容不符合 ConfigModel 的定义。
+    """
+    key = (os.path.abspath(path), os.stat(path).st_mtime_ns)
+    config = _PARSED_CACHE.get(key)
+    if config is None:
+        config = ConfigModel.model_validate_json(Path(path).read_bytes())
+        _PARSED_CACHE.clear()
+        _PARSED_CACHE[key] = config
+    return config
+
+
+@lru_cache(maxsize=1)
+def get_config():
+    """
+    返回进程内共享的 Config 实例。
+    """
+    return Config()
+
 
 class Config:
     def __init__(self):
@@ -8,39 +127,51 @@ class Config:
     
     def load_config(self):
         # Load environment variables from .env file
-        load_dotenv()
+        env = _load_env_once()
+
+        config = _read_config_file(CONFIG_FILE)
+
+        self.email = config.email.model_dump(exclude_unset=True)
+        self.email['password'] = env.get('EMAIL_PASSWORD', config.email.password)
+
+        # 加载 GitHub 相关配置
+        github_config = config.github
+        self.github_token = env.get('GITHUB_TOKEN', github_config.token)
+        self.subscriptions_file = github_config.subscriptions_file
+        self.freq_days = github_config.progress_frequency_days
+        self.exec_time = github_config.progress_execution_time
+
+        # 加载 LLM 相关配置
+        llm_config = config.llm
+        self.llm_model_type = llm_config.model_type
+        self.openai_model_name = llm_config.openai_model_name
+        self.ollama_model_name = llm_config.ollama_model_name
+        self.ollama_api_url = llm_config.ollama_api_url
+        self.ollama_timeout = llm_config.ollama_timeout
+        # Ollama 服务端的上下文窗口（num_ctx），随请求一起发送
+        self.ollama_num_ctx = llm_config.ollama_num_ctx
+
+        # 请求边界：单次生成的最大 token 数，以及 OpenAI 客户端的超时（秒）与重试次数
+        self.max_tokens = llm_config.max_tokens
+        self.openai_timeout = llm_config.openai_timeout
+        self.openai_max_retries = llm_config.openai_max_retries
+        # 模型上下文窗口（token 数），为空时按模型名称自动推断
+        self.context_limit = llm_config.context_limit
+
+        # 相同输入的生成结果缓存
+        self.cache_enabled = llm_config.cache_enabled
+        self.cache_dir = llm_config.cache_dir
+
+        # Azure / Azure Foundry settings (flat keys take precedence over the nested `azure` block)
+        azure_block = llm_config.azure
+        self.azure_base_url = llm_config.azure_base_url or azure_block.base_url
+        self.azure_deployment_name = llm_config.azure_deployment_name or azure_block.deployment_name
+        # allow API key to come from env var AZURE_OPENAI_KEY for security
+        self.azure_api_key = env.get('AZURE_OPENAI_KEY', llm_config.azure_api_key or azure_block.api_key)
+        self.azure_api_version = llm_config.azure_api_version or azure_block.api_version or '2023-05-15'
 
-        with open('config.json', 'r') as f:
-            config = json.load(f)
-            
-            self.email = config.get('email', {})
-            self.email['password'] = os.getenv('EMAIL_PASSWORD', self.email.get('password', ''))
-
-            # 加载 GitHub 相关配置
-            github_config = config.get('github', {})
-            self.github_token = os.getenv('GITHUB_TOKEN', github_config.get('token'))
-            self.subscriptions_file = github_config.get('subscriptions_file')
-            self.freq_days = github_config.get('progress_frequency_days', 1)
-            self.exec_time = github_config.get('progress_execution_time', "08:00")
-
-            # 加载 LLM 相关配置
-            llm_config = config.get('llm', {})
-            self.llm_model_type = llm_config.get('model_type', 'openai')
-            self.openai_model_name = llm_config.get('openai_model_name', 'gpt-4o-mini')
-            self.ollama_model_name = llm_config.get('ollama_model_name', 'llama3')
-            self.ollama_api_url = llm_config.get('ollama_api_url', 'http://localhost:11434/api/chat')
-
-            # Azure / Azure Foundry settings (support both nested `azure` block or flat keys)
-            azure_block = llm_config.get('azure', {}) if isinstance(llm_config.get('azure', {}), dict) else {}
-            self.azure_base_url = llm_config.get('azure_base_url') or azure_block.get('base_url')
-            self.azure_deployment_name = llm_config.get('azure_deployment_name') or azure_block.get('deployment_name')
-            # allow API key to come from env var AZURE_OPENAI_KEY for security
-            self.azure_api_key = os.getenv('AZURE_OPENAI_KEY', llm_config.get('azure_api_key') or azure_block.get('api_key'))
-            self.azure_api_version = llm_config.get('azure_api_version') or azure_block.get('api_version') or '2023-05-15'
-
-            # 加载报告类型配置
-            self.report_types = config.get('report_types', ["github", "hacker_news"])  # 默认报告类型
-            
-            # 加载 Slack 配置
-            slack_config = config.get('slack', {})
-            self.slack_webhook_url = slack_config.get('webhook_url')
+        # 加载报告类型配置
+        self.report_types = list(config.report_types)
+        
+        # 加载 Slack 配置
+        self.slack_webhook_url = config.slack.webhook_url
@@ -5,7 +5,7 @@ import signal  # 导入signal库，用于信号处理
 import sys  # 导入sys库，用于执行系统相关的操作
 from datetime import datetime  # 导入 datetime 模块用于获取当前日期
 
-from config import Config  # 导入配置管理类
+from config import get_config  # 导入配置获取函数
 from github_client import GitHubClient  # 导入GitHub客户端类，处理GitHub API请求
 from hacker_news_client import HackerNewsClient
 from notifier import Notifier  # 导入通知器类，用于发送通知
@@ -24,12 +24,14 @@ def github_job(subscription_manager, github_client, report_generator, notifier,
     LOG.info("[开始执行定时任务]GitHub Repo 项目进展报告")
     subscriptions = subscription_manager.list_subscriptions()  # 获取当前所有订阅
     LOG.info(f"订阅列表：{subscriptions}")
-    for repo in subscriptions:
-        # 遍历每个订阅的仓库，执行以下操作
-        markdown_file_path = github_client.export_progress_by_date_range(repo, days)
-        # 从Markdown文件自动生成进展简报
-        report, _ = report_generator.generate_github_report(markdown_file_path)
-        notifier.notify_github_report(repo, report)
+    # 遍历每个订阅的仓库，导出进展数据
+    markdown_file_paths = [github_client.export_progress_by_date_range(repo, days) for repo in subscriptions]
+    # 从Markdown文件并发生成进展简报
+    results = report_generator.generate_github_reports(markdown_file_paths)
+    for repo, result in zip(subscriptions, results):
+        if result is not None:
+            report, _ = result
+            notifier.notify_github_report(repo, report)
     LOG.info(f"[定时任务执行完毕]")
 
 
@@ -56,7 +58,7 @@ def main():
     # 设置信号处理器
     signal.signal(signal.SIGTERM, graceful_shutdown)
 
-    config = Config()  # 创建配置实例
+    config = get_config()  # 获取配置实例
     github_client = GitHubClient(config.github_token)  # 创建GitHub客户端实例
     hacker_news_client = HackerNewsClient() # 创建 Hacker News 客户端实例
     notifier = Notifier(config.email)  # 创建通知器实例
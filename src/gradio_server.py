@@ -1,6 +1,6 @@
 import gradio as gr  # 导入gradio库用于创建GUI
 
-from config import Config  # 导入配置管理模块
+from config import get_config  # 导入配置管理模块
 from github_client import GitHubClient  # 导入用于GitHub API操作的客户端
 from hacker_news_client import HackerNewsClient
 from report_generator import ReportGenerator  # 导入报告生成器模块
@@ -9,7 +9,7 @@ from subscription_manager import SubscriptionManager  # 导入订阅管理器
 from logger import LOG  # 导入日志记录器
 
 # 创建各个组件的实例
-config = Config()
+config = get_config()
 github_client = GitHubClient(config.github_token)
 hacker_news_client = HackerNewsClient() # 创建 Hacker News 客户端实例
 subscription_manager = SubscriptionManager(config.subscriptions_file)
@@ -0,0 +1,30 @@
+import json
+
+try:
+    import orjson  # 更快的 JSON 编解码库，未安装时退回标准库 json
+except ImportError:
+    orjson = None
+
+
+def loads(data):
+    """
+    解析 JSON 文本。
+
+    :param data: bytes 或 str 形式的 JSON 文本。
+    :return: 解析后的 Python 对象。
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj):
+    """
+    将对象序列化为 UTF-8 编码的 JSON。
+
+    :param obj: 要序列化的 Python 对象。
+    :return: bytes 形式的 JSON 文本，可直接作为 HTTP 请求体发送。
+    """
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False).encode('utf-8')
@@ -1,7 +1,44 @@
-import requests
-from openai import OpenAI  # 导入OpenAI库用于访问GPT模型
+import asyncio
+import random
+import threading
+import time
+from concurrent.futures import Future
+from functools import cached_property
+import json_codec  # JSON 编解码（优先使用 orjson）
+from llm_cache import LLMCache  # 导入 LLM 结果缓存
 from logger import LOG  # 导入日志模块
 
+# enqueue_report 收集请求的时间窗口（毫秒），窗口内到达的请求合并为一个批次发送
+BATCH_WINDOW_MS = 50
+
+# REST 请求的重试策略：限流、超时和服务端错误属于暂时性错误，按带抖动的指数退避重试；
+# 401/403 等其他 4xx 错误通常是配置问题，直接抛出
+MAX_RETRIES = 3
+RETRY_BACKOFF_FACTOR = 0.5
+RETRY_BACKOFF_MAX = 30
+RETRY_STATUS_CODES = (408, 409, 425, 429, 500, 502, 503, 504)
+
+# 常见模型的上下文窗口（token 数），按名称精确匹配，也匹配带日期或版本号后缀的名称
+# （例如 gpt-4-0613、gpt-4o-2024-08-06），未列出的模型不做检查；可通过配置 llm.context_limit 覆盖
+CONTEXT_LIMITS = {
+    "gpt-4.1": 1047576,
+    "gpt-4.1-mini": 1047576,
+    "gpt-4.1-nano": 1047576,
+    "gpt-4o": 128000,
+    "gpt-4o-mini": 128000,
+    "gpt-4-turbo": 128000,
+    "gpt-4-32k": 32768,
+    "gpt-4": 8192,
+    "gpt-3.5-turbo": 16385,
+    "llama3.1": 131072,
+    "llama3": 8192,
+    "gemma2": 8192,
+    "qwen2": 32768,
+}
+
+# 模型类型别名，初始化时统一归一化
+MODEL_ALIASES = {"azure_openai": "azure"}
+
 class LLM:
     def __init__(self, config):
         """
@@ -10,11 +47,15 @@ class LLM:
         :param config: 配置对象，包含所有的模型配置参数。
         """
         self.config = config
-        self.model = config.llm_model_type.lower()  # 获取模型类型并转换为小写
+        model_type = config.llm_model_type.lower()  # 获取模型类型并转换为小写
+        self.model = MODEL_ALIASES.get(model_type, model_type)
         if self.model == "openai":
-            # 标准 OpenAI (OpenAI-hosted)
-            self.client = OpenAI()
-        elif self.model == "azure" or self.model == "azure_openai":
+            # 标准 OpenAI (OpenAI-hosted)，客户端在首次使用时创建
+            self._model_name = config.openai_model_name
+            self._model_id = f"openai:{self._model_name}"  # 结果缓存键中的模型标识
+            self._server_context_limit = None
+            self._create_async_client = self._create_openai_async_client
+        elif self.model == "azure":
             # Azure OpenAI / Azure Foundry: validate required settings
             if not self.config.azure_base_url or not self.config.azure_deployment_name or not self.config.azure_api_key:
                 LOG.error("Azure OpenAI 配置不完整: base_url, deployment_name 和 api_key 必须提供")
@@ -24,12 +65,97 @@ class LLM:
             self.azure_deployment_name = self.config.azure_deployment_name
             self.azure_api_key = self.config.azure_api_key
             self.azure_api_version = getattr(self.config, 'azure_api_version', '2023-05-15')
+            # 构建 Azure OpenAI Chat Completions REST API 路径
+            self._azure_url = f"{self.azure_base_url}/openai/deployments/{self.azure_deployment_name}/chat/completions?api-version={self.azure_api_version}"
+            self._azure_headers = {
+                "Content-Type": "application/json",
+                # Azure OpenAI 使用 `api-key` 头部
+                "api-key": self.azure_api_key
+            }
+            # 每次请求只需在此基础上补充 messages
+            self._azure_base_payload = {
+                "max_tokens": self.config.max_tokens,
+                "temperature": 0.7,
+                "top_p": 1
+            }
+            self._model_name = self.azure_deployment_name
+            self._model_id = f"azure:{self.azure_base_url}:{self.azure_deployment_name}"
+            self._server_context_limit = None
+            self._create_async_client = self._create_httpx_async_client
         elif self.model == "ollama":
             self.api_url = config.ollama_api_url  # 设置Ollama API的URL
+            self._ollama_headers = {"Content-Type": "application/json"}
+            self._model_name = config.ollama_model_name
+            self._model_id = f"ollama:{self.api_url}:{self._model_name}"
+            # Ollama 按服务端的 num_ctx 截断输入，而不是模型本身的上下文窗口
+            self._server_context_limit = config.ollama_num_ctx
+            self._create_async_client = self._create_httpx_async_client
         else:
             LOG.error(f"不支持的模型类型: {self.model}")
             raise ValueError(f"不支持的模型类型: {self.model}")  # 如果模型类型不支持，抛出错误
 
+        # 按模型类型预先绑定同步、流式和异步三种生成方式的实现，调用时无需再判断模型类型
+        self._generate, self._stream, self._agenerate = {
+            "openai": (self._generate_report_openai, self._stream_report_openai, self._agenerate_openai),
+            "azure": (self._generate_report_azure, self._stream_report_azure, self._agenerate_azure),
+            "ollama": (self._generate_report_ollama, self._stream_report_ollama, self._agenerate_ollama),
+        }[self.model]
+
+        # 按系统提示缓存的 system 消息，供 _build_messages 复用
+        self._system_messages = {}
+
+        # 用于估算输入 token 数的编码器，首次使用时创建
+        self._encoder = None
+
+        # 相同输入的结果缓存，可通过配置 llm.cache_enabled 关闭
+        self.cache = LLMCache(config.cache_dir) if config.cache_enabled else None
+
+        # enqueue_report 的待处理队列及后台合并线程
+        self._pending = []
+        self._pending_lock = threading.Lock()
+        self._batch_thread = None
+
+    @cached_property
+    def client(self):
+        """
+        OpenAI 客户端，首次使用时创建；SDK 体积较大，只在使用 OpenAI 时导入。
+        """
+        from openai import OpenAI
+        return OpenAI(timeout=self.config.openai_timeout, max_retries=self.config.openai_max_retries)
+
+    @cached_property
+    def _session(self):
+        """
+        Azure / Ollama 使用的 requests.Session，首次请求时创建，之后复用其连接池。
+        """
+        return self._create_session()
+
+    @staticmethod
+    def _create_session():
+        """
+        创建复用连接池的 requests.Session，并对限流和服务端错误进行指数退避重试。
+
+        :return: 配置好的 requests.Session。
+        """
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        retry = Retry(
+            total=MAX_RETRIES,
+            backoff_factor=RETRY_BACKOFF_FACTOR,
+            backoff_max=RETRY_BACKOFF_MAX,
+            backoff_jitter=RETRY_BACKOFF_FACTOR,  # 加入随机抖动，避免多个请求同时重试
+            status_forcelist=RETRY_STATUS_CODES,
+            allowed_methods=None,  # 默认不重试 POST，这里需要显式放开
+            raise_on_status=False,  # 重试耗尽后返回最后的响应，交给 raise_for_status 处理
+        )
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=10, max_retries=retry)
+        session = requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
     def generate_report(self, system_prompt, user_content):
         """
         生成报告，根据配置选择不同的模型来处理请求。
@@ -38,20 +164,263 @@ class LLM:
         :param user_content: 用户提供的内容，通常是Markdown格式的文本。
         :return: 生成的报告内容。
         """
-        messages = [
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_content},
-        ]
+        cache_key, report = self._cache_lookup(system_prompt, user_content)
+        if report is not None:
+            return report
 
-        # 根据选择的模型调用相应的生成报告方法
-        if self.model == "openai":
-            return self._generate_report_openai(messages)
-        elif self.model == "azure" or self.model == "azure_openai":
-            return self._generate_report_azure(messages)
-        elif self.model == "ollama":
-            return self._generate_report_ollama(messages)
-        else:
-            raise ValueError(f"不支持的模型类型: {self.model}")
+        self._check_input_tokens(system_prompt, user_content)
+        messages = self._build_messages(system_prompt, user_content)
+
+        # 调用初始化时绑定的模型实现
+        report = self._generate(messages)
+        self._cache_store(cache_key, report)
+        return report
+
+    def generate_report_stream(self, system_prompt, user_content):
+        """
+        以流式方式生成报告，模型每返回一段文本就立即产出，无需等待完整响应。
+
+        :param system_prompt: 系统提示信息，包含上下文和规则。
+        :param user_content: 用户提供的内容，通常是Markdown格式的文本。
+        :return: 逐段产出报告内容的迭代器。
+        """
+        self._check_input_tokens(system_prompt, user_content)
+        return self._stream(self._build_messages(system_prompt, user_content))
+
+    def enqueue_report(self, system_prompt, user_content):
+        """
+        将报告请求加入队列，后台线程在 BATCH_WINDOW_MS 时间窗口内合并到达的请求并发发送。
+        适用于同一时刻有多个调用方各自请求报告的场景。
+
+        :param system_prompt: 系统提示信息，包含上下文和规则。
+        :param user_content: 用户提供的内容，通常是Markdown格式的文本。
+        :return: concurrent.futures.Future，完成后其结果为生成的报告内容。
+        """
+        future = Future()
+        with self._pending_lock:
+            self._pending.append((system_prompt, user_content, future))
+            if self._batch_thread is None:
+                self._batch_thread = threading.Thread(target=self._drain_pending, daemon=True)
+                self._batch_thread.start()
+        return future
+
+    def _drain_pending(self):
+        """
+        后台线程：按时间窗口取出队列中的请求，交给单独的线程发送，队列为空时退出。
+        发送不阻塞收集，批次仍在进行时新到达的请求会在下一个时间窗口内发出。
+        """
+        try:
+            while True:
+                time.sleep(BATCH_WINDOW_MS / 1000)
+                with self._pending_lock:
+                    items, self._pending = self._pending, []
+                    if not items:
+                        self._batch_thread = None
+                        return
+                threading.Thread(target=self._dispatch_pending, args=(items,), daemon=True).start()
+        finally:
+            # 出现意外错误退出时也要重置，保证后续 enqueue_report 能启动新的线程
+            with self._pending_lock:
+                if self._batch_thread is threading.current_thread():
+                    self._batch_thread = None
+
+    def _dispatch_pending(self, items):
+        """
+        发送一个时间窗口内收集到的请求，并将结果写回各自的 Future。
+
+        :param items: (system_prompt, user_content, future) 元组列表。
+        """
+        # 跳过调用方已取消的请求；其余 Future 标记为运行中，之后不能再被取消
+        items = [item for item in items if item[2].set_running_or_notify_cancel()]
+        if not items:
+            return
+
+        # 只有一个请求时直接走同步路径，省去创建事件循环和异步客户端的开销
+        if len(items) == 1:
+            system_prompt, user_content, future = items[0]
+            try:
+                future.set_result(self.generate_report(system_prompt, user_content))
+            except Exception as e:
+                future.set_exception(e)
+            return
+
+        # 按输入长度分桶排序，使长度相近的请求相邻提交，便于服务端合并处理
+        items = sorted(items, key=lambda item: len(item[1]).bit_length())
+        try:
+            results = self.generate_reports_batch([(sp, uc) for sp, uc, _ in items])
+        except Exception as e:
+            for _, _, future in items:
+                future.set_exception(e)
+            return
+
+        for (_, _, future), result in zip(items, results):
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    def generate_reports_batch(self, pairs, concurrency=10):
+        """
+        并发生成多份报告，适用于一次需要汇总多个订阅仓库的场景。
+
+        :param pairs: (system_prompt, user_content) 元组列表。
+        :param concurrency: 同时进行的最大请求数。
+        :return: 与 pairs 顺序一致的结果列表，失败的请求对应位置为异常对象。
+        """
+        return asyncio.run(self.agenerate_batch(pairs, concurrency))
+
+    async def agenerate_batch(self, pairs, concurrency=10):
+        """
+        generate_reports_batch 的异步实现，通过信号量限制并发数并用 asyncio.gather 汇总结果。
+
+        :param pairs: (system_prompt, user_content) 元组列表。
+        :param concurrency: 同时进行的最大请求数。
+        :return: 与 pairs 顺序一致的结果列表，失败的请求对应位置为异常对象。
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        # 异步客户端的连接池绑定在当前事件循环上，因此每个批次单独创建
+        client = self._create_async_client(concurrency)
+
+        async def run(system_prompt, user_content):
+            cache_key, report = self._cache_lookup(system_prompt, user_content)
+            if report is not None:
+                return report
+            self._check_input_tokens(system_prompt, user_content)
+            async with semaphore:
+                report = await self._agenerate(client, self._build_messages(system_prompt, user_content))
+            self._cache_store(cache_key, report)
+            return report
+
+        async with client:
+            return await asyncio.gather(*(run(sp, uc) for sp, uc in pairs), return_exceptions=True)
+
+    @staticmethod
+    async def _apost(client, url, **kwargs):
+        """
+        发送异步 POST 请求，遇到超时、连接错误或可重试的状态码时按带抖动的指数退避重试，
+        与同步路径中 requests.Session 的重试策略保持一致。
+
+        :param client: 当前批次使用的 httpx.AsyncClient。
+        :param url: 请求地址。
+        :return: 最后一次请求的响应。
+        """
+        import httpx
+
+        for attempt in range(MAX_RETRIES + 1):
+            try:
+                response = await client.post(url, **kwargs)
+            except httpx.TransportError as e:
+                if attempt == MAX_RETRIES:
+                    raise
+                LOG.warning("请求失败，准备重试（第 {} 次）：{}", attempt + 1, e)
+            else:
+                if response.status_code not in RETRY_STATUS_CODES or attempt == MAX_RETRIES:
+                    return response
+                LOG.warning("请求返回状态码 {}，准备重试（第 {} 次）", response.status_code, attempt + 1)
+            delay = min(RETRY_BACKOFF_MAX, RETRY_BACKOFF_FACTOR * 2 ** attempt)
+            await asyncio.sleep(delay + random.uniform(0, RETRY_BACKOFF_FACTOR))
+
+    def _create_openai_async_client(self, concurrency):
+        """
+        为一个批次创建 AsyncOpenAI 客户端（SDK 自带连接池）。
+        """
+        from openai import AsyncOpenAI
+        return AsyncOpenAI(timeout=self.config.openai_timeout, max_retries=self.config.openai_max_retries)
+
+    @staticmethod
+    def _create_httpx_async_client(concurrency):
+        """
+        为一个批次创建 httpx.AsyncClient，连接数与并发数一致。
+        """
+        import httpx
+        return httpx.AsyncClient(limits=httpx.Limits(max_connections=concurrency))
+
+    def _context_limit(self):
+        """
+        当前模型的上下文窗口大小，未知模型返回 None（不做检查）。
+        """
+        if self.config.context_limit:
+            return self.config.context_limit
+        name = self._model_name.split(':')[0].lower()  # 去掉 Ollama 的标签，例如 llama3.1:8b
+        limit = CONTEXT_LIMITS.get(name)
+        if limit is None:
+            # 只接受以数字开头的后缀，避免 gpt-4 误匹配 gpt-4.1、gpt-4-32k 等不同窗口的模型
+            for known, known_limit in CONTEXT_LIMITS.items():
+                suffix = name[len(known) + 1:]
+                if name.startswith(known + "-") and suffix[:1].isdigit():
+                    limit = known_limit
+                    break
+        # 服务端有自己的上下文上限（如 Ollama 的 num_ctx）时，以两者中较小的为准
+        if self._server_context_limit:
+            return min(limit, self._server_context_limit) if limit else self._server_context_limit
+        return limit
+
+    def count_tokens(self, text):
+        """
+        统计文本的 token 数。安装了 tiktoken 时精确计算，否则按字符粗略估算
+        （ASCII 约 4 个字符一个 token，其他字符按一个 token 计）。
+
+        :param text: 要统计的文本。
+        :return: token 数。
+        """
+        if self._encoder is None:
+            try:
+                import tiktoken
+                try:
+                    self._encoder = tiktoken.encoding_for_model(self._model_name)
+                except KeyError:
+                    self._encoder = tiktoken.get_encoding("cl100k_base")
+            except ImportError:
+                self._encoder = False
+        if self._encoder:
+            return len(self._encoder.encode(text))
+        non_ascii = sum(1 for ch in text if ord(ch) > 127)
+        return (len(text) - non_ascii + 3) // 4 + non_ascii
+
+    def _check_input_tokens(self, system_prompt, user_content):
+        """
+        发送请求前检查输入长度，超过模型上下文窗口时直接抛出错误，避免浪费一次请求。
+
+        :raises ValueError: 输入 token 数加上 max_tokens 超过上下文窗口。
+        """
+        n_in = self.count_tokens(system_prompt or "") + self.count_tokens(user_content)
+        LOG.info("输入 token 数: {}", n_in)
+        limit = self._context_limit()
+        if limit is not None and n_in + self.config.max_tokens > limit:
+            LOG.error(f"输入内容过长: {n_in} + {self.config.max_tokens} 超过模型上下文窗口 {limit}")
+            raise ValueError(f"Input too long: {n_in} input tokens + {self.config.max_tokens} max_tokens exceeds context limit {limit}")
+
+    def _cache_lookup(self, system_prompt, user_content):
+        """
+        查询缓存。
+
+        :return: (缓存键, 缓存的报告内容)，未启用缓存或未命中时报告内容为 None。
+        """
+        if self.cache is None:
+            return None, None
+        cache_key = LLMCache.make_key(self._model_id, system_prompt, user_content)
+        report = self.cache.get(cache_key)
+        if report is not None:
+            LOG.info("命中 LLM 缓存，跳过模型调用。")
+        return cache_key, report
+
+    def _cache_store(self, cache_key, report):
+        if cache_key is not None:
+            self.cache.set(cache_key, report)
+
+    def _build_messages(self, system_prompt, user_content):
+        """
+        构建发送给模型的消息列表。同一报告类型的系统提示基本不变，其消息对象只创建一次并复用。
+
+        :param system_prompt: 系统提示信息。
+        :param user_content: 用户提供的内容。
+        :return: 包含系统提示和用户内容的消息列表。
+        """
+        system_message = self._system_messages.get(system_prompt)
+        if system_message is None:
+            system_message = self._system_messages.setdefault(system_prompt, {"role": "system", "content": system_prompt})
+        return [system_message, {"role": "user", "content": user_content}]
 
     def _generate_report_openai(self, messages):
         """
@@ -60,18 +429,69 @@ class LLM:
         :param messages: 包含系统提示和用户内容的消息列表。
         :return: 生成的报告内容。
         """
-        LOG.info(f"使用 OpenAI {self.config.openai_model_name} 模型生成报告。")
+        LOG.info("使用 OpenAI {} 模型生成报告。", self._model_name)
         try:
             response = self.client.chat.completions.create(
-                model=self.config.openai_model_name,  # 使用配置中的OpenAI模型名称
-                messages=messages
+                model=self._model_name,  # 使用配置中的OpenAI模型名称
+                messages=messages,
+                max_tokens=self.config.max_tokens,  # 限制输出长度，避免响应时间和开销失控
+                temperature=0.7,
+                top_p=1
             )
-            LOG.debug("GPT 响应: {}", response)
+            # 仅在 DEBUG 级别生效时才序列化响应，使用 pydantic 的 JSON 序列化代替开销较大的 repr
+            LOG.opt(lazy=True).debug("GPT 响应: {}", response.model_dump_json)
             return response.choices[0].message.content  # 返回生成的报告内容
         except Exception as e:
             LOG.error(f"生成报告时发生错误：{e}")
             raise
 
+    async def _agenerate_openai(self, client, messages):
+        """
+        _generate_report_openai 的异步版本，使用当前批次共享的 AsyncOpenAI 客户端。
+
+        :param client: 当前批次使用的 AsyncOpenAI 客户端。
+        :param messages: 包含系统提示和用户内容的消息列表。
+        :return: 生成的报告内容。
+        """
+        LOG.info("使用 OpenAI {} 模型生成报告。", self._model_name)
+        try:
+            response = await client.chat.completions.create(
+                model=self._model_name,
+                messages=messages,
+                max_tokens=self.config.max_tokens,
+                temperature=0.7,
+                top_p=1
+            )
+            LOG.opt(lazy=True).debug("GPT 响应: {}", response.model_dump_json)
+            return response.choices[0].message.content
+        except Exception as e:
+            LOG.error(f"生成报告时发生错误：{e}")
+            raise
+
+    def _stream_report_openai(self, messages):
+        """
+        使用 OpenAI GPT 模型流式生成报告。
+
+        :param messages: 包含系统提示和用户内容的消息列表。
+        :return: 逐段产出报告内容的迭代器。
+        """
+        LOG.info("使用 OpenAI {} 模型流式生成报告。", self._model_name)
+        try:
+            stream = self.client.chat.completions.create(
+                model=self._model_name,
+                messages=messages,
+                max_tokens=self.config.max_tokens,
+                temperature=0.7,
+                top_p=1,
+                stream=True
+            )
+            for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        except Exception as e:
+            LOG.error(f"生成报告时发生错误：{e}")
+            raise
+
     def _generate_report_azure(self, messages):
         """
         使用 Azure OpenAI（包括 Azure Foundry 部署）通过 REST API 生成报告。
@@ -79,46 +499,87 @@ class LLM:
         :param messages: 包含系统提示和用户内容的消息列表。
         :return: 生成的报告内容。
         """
-        LOG.info(f"使用 Azure OpenAI 部署 {self.azure_deployment_name} 生成报告。")
+        LOG.info("使用 Azure OpenAI 部署 {} 生成报告。", self.azure_deployment_name)
         try:
-            # 构建 Azure OpenAI Chat Completions REST API 路径
-            url = f"{self.azure_base_url}/openai/deployments/{self.azure_deployment_name}/chat/completions?api-version={self.azure_api_version}"
-
-            payload = {
-                "messages": messages,
-                "max_tokens": 4000,
-                "temperature": 0.7,
-                "top_p": 1
-            }
+            payload = {**self._azure_base_payload, "messages": messages}
+            response = self._session.post(self._azure_url, headers=self._azure_headers, data=json_codec.dumps(payload), timeout=60)
+            response.raise_for_status()
+            return self._parse_azure_response(json_codec.loads(response.content))
+        except Exception as e:
+            LOG.error(f"生成报告时发生错误（Azure）: {e}")
+            raise
 
-            headers = {
-                "Content-Type": "application/json",
-                # Azure OpenAI 使用 `api-key` 头部
-                "api-key": self.azure_api_key
-            }
+    async def _agenerate_azure(self, client, messages):
+        """
+        _generate_report_azure 的异步版本，使用共享的 httpx.AsyncClient 发送请求。
 
-            response = requests.post(url, headers=headers, json=payload, timeout=60)
+        :param client: 当前批次使用的 httpx.AsyncClient。
+        :param messages: 包含系统提示和用户内容的消息列表。
+        :return: 生成的报告内容。
+        """
+        LOG.info("使用 Azure OpenAI 部署 {} 生成报告。", self.azure_deployment_name)
+        try:
+            payload = {**self._azure_base_payload, "messages": messages}
+            response = await self._apost(client, self._azure_url, headers=self._azure_headers, content=json_codec.dumps(payload), timeout=60)
             response.raise_for_status()
-            data = response.json()
-            LOG.debug("Azure OpenAI 响应: {}", data)
-
-            # 标准 Azure OpenAI 返回 choices -> [ { message: { role, content } } ]
-            choices = data.get('choices') or []
-            if not choices:
-                LOG.error("Azure OpenAI 返回的响应中没有 choices: %s", data)
-                raise ValueError("Azure OpenAI response missing choices")
-
-            message = choices[0].get('message') or {}
-            content = message.get('content')
-            if content:
-                return content
-
-            LOG.error("无法从 Azure OpenAI 响应中提取文本: %s", data)
-            raise ValueError("Cannot extract text from Azure OpenAI response")
+            return self._parse_azure_response(json_codec.loads(response.content))
+        except Exception as e:
+            LOG.error(f"生成报告时发生错误（Azure）: {e}")
+            raise
+
+    def _stream_report_azure(self, messages):
+        """
+        使用 Azure OpenAI 流式生成报告，逐帧解析 Server-Sent Events 响应。
+
+        :param messages: 包含系统提示和用户内容的消息列表。
+        :return: 逐段产出报告内容的迭代器。
+        """
+        LOG.info("使用 Azure OpenAI 部署 {} 流式生成报告。", self.azure_deployment_name)
+        try:
+            payload = {**self._azure_base_payload, "messages": messages, "stream": True}
+            with self._session.post(self._azure_url, headers=self._azure_headers, data=json_codec.dumps(payload), timeout=60, stream=True) as response:
+                response.raise_for_status()
+                # SSE 按规范为 UTF-8 编码，直接处理原始字节，不依赖响应头中的 charset
+                for line in response.iter_lines():
+                    # SSE 帧格式为 `data: {...}`，以 `data: [DONE]` 结束，其余行（空行、注释等）忽略
+                    if not line or not line.startswith(b"data:"):
+                        continue
+                    data = line[len(b"data:"):].strip()
+                    if data == b"[DONE]":
+                        break
+                    # Azure 的首帧可能只包含内容过滤结果，choices 为空
+                    choices = json_codec.loads(data).get('choices') or []
+                    if choices:
+                        content = (choices[0].get('delta') or {}).get('content')
+                        if content:
+                            yield content
         except Exception as e:
             LOG.error(f"生成报告时发生错误（Azure）: {e}")
             raise
 
+    def _parse_azure_response(self, data):
+        """
+        从 Azure OpenAI 的响应数据中提取报告内容。
+
+        :param data: 解析后的 JSON 响应。
+        :return: 生成的报告内容。
+        """
+        LOG.opt(lazy=True).debug("Azure OpenAI 响应: {}", lambda: json_codec.dumps(data).decode('utf-8'))
+
+        # 标准 Azure OpenAI 返回 choices -> [ { message: { role, content } } ]
+        choices = data.get('choices') or []
+        if not choices:
+            LOG.error("Azure OpenAI 返回的响应中没有 choices: {}", data)
+            raise ValueError("Azure OpenAI response missing choices")
+
+        message = choices[0].get('message') or {}
+        content = message.get('content')
+        if content:
+            return content
+
+        LOG.error("无法从 Azure OpenAI 响应中提取文本: {}", data)
+        raise ValueError("Cannot extract text from Azure OpenAI response")
+
     def _generate_report_ollama(self, messages):
         """
         使用 Ollama LLaMA 模型生成报告。
@@ -126,36 +587,93 @@ class LLM:
         :param messages: 包含系统提示和用户内容的消息列表。
         :return: 生成的报告内容。
         """
-        LOG.info(f"使用 Ollama {self.config.ollama_model_name} 模型生成报告。")
+        LOG.info("使用 Ollama {} 模型生成报告。", self._model_name)
         try:
-            payload = {
-                "model": self.config.ollama_model_name,  # 使用配置中的Ollama模型名称
-                "messages": messages,
-                "max_tokens": 4000,
-                "temperature": 0.7,
-                "stream": False
-            }
+            payload = json_codec.dumps(self._ollama_payload(messages))
+            response = self._session.post(self.api_url, headers=self._ollama_headers, data=payload, timeout=self.config.ollama_timeout)  # 发送POST请求到Ollama API
+            return self._parse_ollama_response(json_codec.loads(response.content))
+        except Exception as e:
+            LOG.error(f"生成报告时发生错误：{e}")
+            raise
+
+    async def _agenerate_ollama(self, client, messages):
+        """
+        _generate_report_ollama 的异步版本，使用共享的 httpx.AsyncClient 发送请求。
 
-            response = requests.post(self.api_url, json=payload)  # 发送POST请求到Ollama API
-            response_data = response.json()
+        :param client: 当前批次使用的 httpx.AsyncClient。
+        :param messages: 包含系统提示和用户内容的消息列表。
+        :return: 生成的报告内容。
+        """
+        LOG.info("使用 Ollama {} 模型生成报告。", self._model_name)
+        try:
+            payload = json_codec.dumps(self._ollama_payload(messages))
+            response = await self._apost(client, self.api_url, headers=self._ollama_headers, content=payload, timeout=self.config.ollama_timeout)
+            return self._parse_ollama_response(json_codec.loads(response.content))
+        except Exception as e:
+            LOG.error(f"生成报告时发生错误：{e}")
+            raise
 
-            # 调试输出查看完整的响应结构
-            LOG.debug("Ollama 响应: {}", response_data)
+    def _stream_report_ollama(self, messages):
+        """
+        使用 Ollama LLaMA 模型流式生成报告，响应为逐行的 JSON 对象。
 
-            # 直接从响应数据中获取 content
-            message_content = response_data.get("message", {}).get("content", None)
-            if message_content:
-                return message_content  # 返回生成的报告内容
-            else:
-                LOG.error("无法从响应中提取报告内容。")
-                raise ValueError("Ollama API 返回的响应结构无效")
+        :param messages: 包含系统提示和用户内容的消息列表。
+        :return: 逐段产出报告内容的迭代器。
+        """
+        LOG.info("使用 Ollama {} 模型流式生成报告。", self._model_name)
+        try:
+            payload = json_codec.dumps(self._ollama_payload(messages, stream=True))
+            with self._session.post(self.api_url, headers=self._ollama_headers, data=payload, timeout=self.config.ollama_timeout, stream=True) as response:
+                response.raise_for_status()
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    chunk = json_codec.loads(line)
+                    if chunk.get("error"):
+                        raise ValueError(f"Ollama API 返回错误: {chunk['error']}")
+                    content = chunk.get("message", {}).get("content")
+                    if content:
+                        yield content
+                    if chunk.get("done"):
+                        break
         except Exception as e:
             LOG.error(f"生成报告时发生错误：{e}")
             raise
 
+    def _ollama_payload(self, messages, stream=False):
+        return {
+            "model": self._model_name,  # 使用配置中的Ollama模型名称
+            "messages": messages,
+            # Ollama 的生成参数需放在 options 中，顶层的 max_tokens / temperature 会被忽略
+            "options": {
+                "num_ctx": self._context_limit(),  # 与发送前检查使用的上限保持一致，避免服务端静默截断
+                "num_predict": self.config.max_tokens,
+                "temperature": 0.7
+            },
+            "stream": stream
+        }
+
+    def _parse_ollama_response(self, response_data):
+        """
+        从 Ollama 的响应数据中提取报告内容。
+
+        :param response_data: 解析后的 JSON 响应。
+        :return: 生成的报告内容。
+        """
+        # 调试输出查看完整的响应结构
+        LOG.opt(lazy=True).debug("Ollama 响应: {}", lambda: json_codec.dumps(response_data).decode('utf-8'))
+
+        # 直接从响应数据中获取 content
+        message_content = response_data.get("message", {}).get("content", None)
+        if message_content:
+            return message_content  # 返回生成的报告内容
+        else:
+            LOG.error("无法从响应中提取报告内容。")
+            raise ValueError("Ollama API 返回的响应结构无效")
+
 if __name__ == '__main__':
-    from config import Config  # 导入配置管理类
-    config = Config()
+    from config import get_config  # 导入配置获取函数
+    config = get_config()
     llm = LLM(config)
 
     markdown_content="""
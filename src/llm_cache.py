@@ -0,0 +1,130 @@
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+import json_codec  # JSON 编解码（优先使用 orjson）
+from logger import LOG  # 导入日志模块
+
+# 同一缓存目录的所有 LLMCache 实例共用一把锁（Gradio 每次点击都会新建实例）
+_PATH_LOCKS = {}
+_PATH_LOCKS_GUARD = threading.Lock()
+
+
+def _lock_for(path):
+    with _PATH_LOCKS_GUARD:
+        return _PATH_LOCKS.setdefault(os.path.realpath(path), threading.Lock())
+
+
+class LLMCache:
+    def __init__(self, cache_dir, maxsize=256, max_entries=1024, max_age=30 * 24 * 3600):
+        """
+        初始化 LLM 结果缓存：内存中保留最近使用的结果，同时写入磁盘以便重启后复用。
+        磁盘上每个结果单独存为一个文件，通过原子替换写入，多个实例或进程同时写入也不会互相覆盖。
+
+        :param cache_dir: 磁盘缓存所在目录。
+        :param maxsize: 内存中最多保留的结果数。
+        :param max_entries: 磁盘上最多保留的结果数，超出时删除最久未写入的结果。
+        :param max_age: 磁盘结果的最长保留时间（秒），过期后视为未命中并删除。
+        """
+        os.makedirs(cache_dir, exist_ok=True)
+        self.cache_dir = cache_dir
+        self.maxsize = maxsize
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self._memory = OrderedDict()
+        self._lock = _lock_for(cache_dir)
+
+    @staticmethod
+    def make_key(model_id, system_prompt, user_content):
+        """
+        根据模型标识和输入内容计算缓存键，模型或部署变化时键也随之变化，不会命中旧结果。
+
+        :param model_id: 模型标识，例如 "openai:gpt-4o-mini"。
+        :param system_prompt: 系统提示信息。
+        :param user_content: 用户提供的内容。
+        :return: 十六进制的缓存键。
+        """
+        raw = f"{system_prompt}\x00{user_content}\x00{model_id}".encode('utf-8')
+        return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+    def get(self, key):
+        """
+        读取缓存的结果，未命中或已过期时返回 None。
+        """
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return self._memory[key]
+            path = self._path(key)
+            try:
+                if time.time() - os.path.getmtime(path) > self.max_age:
+                    self._remove(path)
+                    return None
+                with open(path, 'rb') as f:
+                    value = json_codec.loads(f.read())
+            except FileNotFoundError:
+                return None
+            except Exception as e:
+                LOG.warning("读取 LLM 缓存失败：{}", e)
+                return None
+            self._remember(key, value)
+            return value
+
+    def set(self, key, value):
+        """
+        写入结果到内存和磁盘缓存。
+        """
+        with self._lock:
+            self._remember(key, value)
+            try:
+                # 先写临时文件再原子替换，读取方不会看到写了一半的结果
+                fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(json_codec.dumps(value))
+                os.replace(tmp_path, self._path(key))
+            except Exception as e:
+                LOG.warning("写入 LLM 缓存失败：{}", e)
+                return
+            self._prune()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _prune(self):
+        """
+        删除过期的结果，并在结果数超过 max_entries 时删除最久未写入的结果。
+        """
+        now = time.time()
+        entries = []
+        with os.scandir(self.cache_dir) as it:
+            for entry in it:
+                if not entry.name.endswith('.json'):
+                    continue
+                try:
+                    mtime = entry.stat().st_mtime
+                except FileNotFoundError:
+                    continue  # 其他进程刚刚删除
+                if now - mtime > self.max_age:
+                    self._remove(entry.path)
+                else:
+                    entries.append((mtime, entry.path))
+        if len(entries) > self.max_entries:
+            entries.sort()
+            for _, path in entries[:len(entries) - self.max_entries]:
+                self._remove(path)
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def _remember(self, key, value):
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        if len(self._memory) > self.maxsize:
+            self._memory.popitem(last=False)
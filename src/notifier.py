@@ -53,8 +53,8 @@ class Notifier:
             LOG.error(f"发送邮件失败：{str(e)}")
 
 if __name__ == '__main__':
-    from config import Config
-    config = Config()
+    from config import get_config
+    config = get_config()
     notifier = Notifier(config.email)
 
     # 测试 GitHub 报告邮件通知
@@ -37,6 +37,34 @@ class ReportGenerator:
         LOG.info(f"GitHub 项目报告已保存到 {report_file_path}")
         return report, report_file_path
 
+    def generate_github_reports(self, markdown_file_paths):
+        """
+        批量生成多个 GitHub 项目的报告，LLM 请求并发发送，结果按输入顺序返回。
+        单个项目生成失败时记录错误，对应位置返回 None，不影响其他项目。
+        """
+        markdown_contents = []
+        for markdown_file_path in markdown_file_paths:
+            with open(markdown_file_path, 'r') as file:
+                markdown_contents.append(file.read())
+
+        system_prompt = self.prompts.get("github")
+        reports = self.llm.generate_reports_batch([(system_prompt, content) for content in markdown_contents])
+
+        results = []
+        for markdown_file_path, report in zip(markdown_file_paths, reports):
+            if isinstance(report, Exception):
+                LOG.error(f"GitHub 项目报告生成失败 {markdown_file_path}: {report}")
+                results.append(None)
+                continue
+
+            report_file_path = os.path.splitext(markdown_file_path)[0] + "_report.md"
+            with open(report_file_path, 'w+') as report_file:
+                report_file.write(report)
+
+            LOG.info(f"GitHub 项目报告已保存到 {report_file_path}")
+            results.append((report, report_file_path))
+        return results
+
     def generate_hn_topic_report(self, markdown_file_path):
         """
         生成 Hacker News 小时主题的报告，并保存为 {original_filename}_topic.md。
@@ -90,10 +118,10 @@ class ReportGenerator:
 
 
 if __name__ == '__main__':
-    from config import Config  # 导入配置管理类
+    from config import get_config  # 导入配置获取函数
     from llm import LLM
 
-    config = Config()
+    config = get_config()
     llm = LLM(config)
     report_generator = ReportGenerator(llm, config.report_types)
 
@@ -0,0 +1,85 @@
+import sys
+import os
+import json
+import tempfile
+import unittest
+from unittest.mock import patch
+
+# 将 src 目录添加到模块搜索路径，方便导入项目中的模块
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import config as config_module  # 导入配置模块
+from config import Config  # 导入要测试的 Config 类
+
+class TestConfig(unittest.TestCase):
+    def setUp(self):
+        """
+        在每个测试方法运行前执行，写入临时配置文件并清空解析缓存。
+        """
+        self.tmp_file = tempfile.NamedTemporaryFile('w', suffix='.json', delete=False)
+        json.dump({"email": {"password": "from_file"}, "llm": {"model_type": "ollama"}}, self.tmp_file)
+        self.tmp_file.close()
+
+        config_module._PARSED_CACHE.clear()
+        patcher = patch.object(config_module, 'CONFIG_FILE', self.tmp_file.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        """
+        在每个测试方法运行后执行，删除临时配置文件。
+        """
+        os.remove(self.tmp_file.name)
+
+    def test_parsed_config_is_reused(self):
+        """
+        测试未修改的配置文件只解析一次，且各实例之间互不影响。
+        """
+        with patch.object(config_module.ConfigModel, 'model_validate_json', wraps=config_module.ConfigModel.model_validate_json) as mock_loads:
+            first = Config()
+            second = Config()
+        mock_loads.assert_called_once()
+
+        first.email['password'] = "changed"
+        self.assertEqual(second.email['password'], os.getenv('EMAIL_PASSWORD', "from_file"))
+        self.assertEqual(second.llm_model_type, "ollama")
+
+    def test_modified_config_is_reparsed(self):
+        """
+        测试配置文件修改后会重新解析。
+        """
+        self.assertEqual(Config().llm_model_type, "ollama")
+
+        with open(self.tmp_file.name, 'w') as f:
+            json.dump({"llm": {"model_type": "openai"}}, f)
+        stat = os.stat(self.tmp_file.name)
+        os.utime(self.tmp_file.name, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        self.assertEqual(Config().llm_model_type, "openai")
+
+    def test_non_dict_azure_block_falls_back_to_flat_keys(self):
+        """
+        测试 `azure` 块不是对象（例如 null）时仍可加载，并使用扁平的 azure_* 配置。
+        """
+        with open(self.tmp_file.name, 'w') as f:
+            json.dump({"llm": {"azure": None, "azure_base_url": "https://example.azure.com",
+                               "azure_deployment_name": "gpt-4o"}}, f)
+
+        config = Config()
+        self.assertEqual(config.azure_base_url, "https://example.azure.com")
+        self.assertEqual(config.azure_deployment_name, "gpt-4o")
+        self.assertEqual(config.azure_api_version, "2023-05-15")
+
+    def test_invalid_config_is_rejected(self):
+        """
+        测试字段类型不符合定义的配置文件在加载时直接报错。
+        """
+        with open(self.tmp_file.name, 'w') as f:
+            json.dump({"llm": {"max_tokens": "a lot"}}, f)
+
+        with self.assertRaises(ValueError):
+            Config()
+
+
+if __name__ == '__main__':
+    unittest.main()
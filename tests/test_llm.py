@@ -1,7 +1,10 @@
 import sys
 import os
+import json
+import tempfile
+import time
 import unittest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
 
 # 将 src 目录添加到模块搜索路径，方便导入项目中的模块
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
@@ -15,6 +18,8 @@ class TestLLM(unittest.TestCase):
         在每个测试方法运行前执行，初始化 LLM 实例和测试数据。
         """
         self.config = Config()  # 初始化配置对象
+        self.config.llm_model_type = "ollama"  # 默认使用 Ollama，避免依赖真实的云端凭据
+        self.config.cache_enabled = False  # 关闭结果缓存，避免测试之间互相影响
         self.llm = LLM(self.config)  # 使用配置对象初始化 LLM 实例
 
         # 设置示例的系统提示信息
@@ -40,7 +45,7 @@ class TestLLM(unittest.TestCase):
             llm = LLM(self.config)
         mock_log_error.assert_called_with("不支持的模型类型: invalid_model")
 
-    @patch('llm.requests.post')
+    @patch('requests.Session.post')
     @patch('llm.LOG.error')
     def test_ollama_invalid_response_structure(self, mock_log_error, mock_post):
         """
@@ -48,7 +53,7 @@ class TestLLM(unittest.TestCase):
         """
         # 模拟 Ollama API 的无效响应
         mock_response = MagicMock()
-        mock_response.json.return_value = {"invalid_key": "no_content_here"}
+        mock_response.content = json.dumps({"invalid_key": "no_content_here"}).encode()
         mock_post.return_value = mock_response
 
         with self.assertRaises(ValueError):
@@ -57,7 +62,7 @@ class TestLLM(unittest.TestCase):
 
 
     @patch('llm.LOG.error')
-    @patch('llm.OpenAI')
+    @patch('openai.OpenAI')
     def test_openai_exception_handling(self, mock_openai, mock_log_error):
         """
         测试调用 OpenAI 模型时发生异常的错误处理路径。
@@ -75,6 +80,291 @@ class TestLLM(unittest.TestCase):
         # 检查是否记录了预期的错误日志
         mock_log_error.assert_called_with("生成报告时发生错误：OpenAI API error")
 
+    @patch('requests.Session.post')
+    def test_ollama_generate_report_stream(self, mock_post):
+        """
+        测试 Ollama 流式生成报告时逐行解析 JSON 并依次产出内容。
+        """
+        mock_response = mock_post.return_value.__enter__.return_value
+        mock_response.iter_lines.return_value = [
+            b'{"message": {"content": "Hello"}, "done": false}',
+            b'',
+            b'{"message": {"content": " world"}, "done": false}',
+            b'{"message": {"content": ""}, "done": true}',
+        ]
+
+        chunks = list(self.llm.generate_report_stream(self.system_prompt, self.github_content))
+
+        self.assertEqual(chunks, ["Hello", " world"])
+        _, kwargs = mock_post.call_args
+        payload = json.loads(kwargs["data"])
+        self.assertTrue(payload["stream"])
+        self.assertEqual(payload["options"]["num_predict"], self.config.max_tokens)
+        self.assertNotIn("max_tokens", payload)
+        self.assertTrue(kwargs["stream"])
+
+    @patch('requests.Session.post')
+    def test_ollama_generate_report_stream_error(self, mock_post):
+        """
+        测试 Ollama 流式响应返回错误帧或非 2xx 状态码时抛出异常，而不是静默返回空结果。
+        """
+        mock_response = mock_post.return_value.__enter__.return_value
+        mock_response.iter_lines.return_value = [b'{"error": "model \'llama3.1\' not found"}']
+        with self.assertRaises(ValueError):
+            list(self.llm.generate_report_stream(self.system_prompt, self.github_content))
+
+        import requests
+        mock_response.raise_for_status.side_effect = requests.HTTPError("404 Client Error: Not Found")
+        with self.assertRaises(requests.HTTPError):
+            list(self.llm.generate_report_stream(self.system_prompt, self.github_content))
+
+    @patch('requests.Session.post')
+    def test_azure_generate_report_stream(self, mock_post):
+        """
+        测试 Azure 流式生成报告时按 UTF-8 逐帧解析 SSE，跳过内容过滤帧和注释行，遇到 [DONE] 停止。
+        """
+        self.config.llm_model_type = "azure"
+        self.config.azure_base_url = "https://example.openai.azure.com/"
+        self.config.azure_deployment_name = "gpt-4o"
+        self.config.azure_api_key = "test-key"
+        self.llm = LLM(self.config)
+
+        mock_response = mock_post.return_value.__enter__.return_value
+        mock_response.iter_lines.return_value = [
+            b'data: {"choices": [], "prompt_filter_results": []}',
+            b'',
+            b'data: {"choices": [{"delta": {"role": "assistant"}}]}',
+            'data: {"choices": [{"delta": {"content": "你好"}}]}'.encode('utf-8'),
+            b': keep-alive',
+            b'data: {"choices": [{"delta": {"content": " world"}}]}',
+            b'data: [DONE]',
+            b'data: {"choices": [{"delta": {"content": "ignored"}}]}',
+        ]
+
+        chunks = list(self.llm.generate_report_stream(self.system_prompt, self.github_content))
+
+        self.assertEqual(chunks, ["你好", " world"])
+        _, kwargs = mock_post.call_args
+        self.assertTrue(json.loads(kwargs["data"])["stream"])
+        mock_response.iter_lines.assert_called_once_with()
+
+    @patch('openai.OpenAI')
+    def test_openai_generate_report_stream(self, mock_openai):
+        """
+        测试 OpenAI 流式生成报告时只产出非空的 delta.content。
+        """
+        self.config.llm_model_type = "openai"
+        self.llm = LLM(self.config)
+
+        def chunk(content):
+            item = MagicMock()
+            item.choices[0].delta.content = content
+            return item
+
+        empty = MagicMock()
+        empty.choices = []
+        mock_openai.return_value.chat.completions.create.return_value = iter([chunk(None), chunk("Hello"), empty, chunk(" world")])
+
+        chunks = list(self.llm.generate_report_stream(self.system_prompt, self.github_content))
+
+        self.assertEqual(chunks, ["Hello", " world"])
+        _, kwargs = mock_openai.return_value.chat.completions.create.call_args
+        self.assertTrue(kwargs["stream"])
+
+    @patch('openai.OpenAI')
+    def test_openai_request_bounds(self, mock_openai):
+        """
+        测试 OpenAI 客户端和请求是否带上配置中的超时、重试次数和 max_tokens 限制。
+        """
+        self.config.llm_model_type = "openai"
+        self.llm = LLM(self.config)
+        mock_openai.assert_not_called()  # 客户端在首次使用时才创建
+
+        mock_openai.return_value.chat.completions.create.return_value.choices[0].message.content = "report"
+        self.assertEqual(self.llm.generate_report(self.system_prompt, self.github_content), "report")
+        self.assertEqual(self.llm.generate_report(self.system_prompt, "other content"), "report")
+        mock_openai.assert_called_once_with(timeout=self.config.openai_timeout, max_retries=self.config.openai_max_retries)
+
+        _, kwargs = mock_openai().chat.completions.create.call_args
+        self.assertEqual(kwargs["max_tokens"], self.config.max_tokens)
+
+    @patch('httpx.AsyncClient')
+    def test_ollama_generate_reports_batch(self, mock_async_client):
+        """
+        测试批量生成报告时结果按输入顺序返回，且单个请求失败不影响其他请求。
+        """
+        ok_response = MagicMock()
+        ok_response.content = json.dumps({"message": {"content": "report"}}).encode()
+        bad_response = MagicMock()
+        bad_response.content = json.dumps({"invalid_key": "no_content_here"}).encode()
+
+        client = mock_async_client.return_value
+        client.post = AsyncMock(side_effect=[ok_response, bad_response, ok_response])
+
+        pairs = [(self.system_prompt, self.github_content)] * 3
+        results = self.llm.generate_reports_batch(pairs)
+
+        self.assertEqual(len(results), 3)
+        self.assertEqual(results[0], "report")
+        self.assertIsInstance(results[1], ValueError)
+        self.assertEqual(results[2], "report")
+        self.assertEqual(client.post.await_count, 3)
+
+    @patch('llm.asyncio.sleep', new_callable=AsyncMock)
+    @patch('httpx.AsyncClient')
+    def test_ollama_batch_retries_transient_errors(self, mock_async_client, mock_sleep):
+        """
+        测试批量请求遇到可重试的状态码时退避重试，遇到鉴权错误时直接返回不重试。
+        """
+        unavailable = MagicMock(status_code=503)
+        unauthorized = MagicMock(status_code=401)
+        unauthorized.content = json.dumps({"error": "unauthorized"}).encode()
+        ok_response = MagicMock(status_code=200)
+        ok_response.content = json.dumps({"message": {"content": "report"}}).encode()
+
+        client = mock_async_client.return_value
+        client.post = AsyncMock(side_effect=[unavailable, ok_response])
+        self.assertEqual(self.llm.generate_reports_batch([(self.system_prompt, self.github_content)]), ["report"])
+        self.assertEqual(client.post.await_count, 2)
+        mock_sleep.assert_awaited_once()
+
+        client.post = AsyncMock(side_effect=[unauthorized, ok_response])
+        results = self.llm.generate_reports_batch([(self.system_prompt, self.github_content)])
+        self.assertIsInstance(results[0], ValueError)
+        self.assertEqual(client.post.await_count, 1)
+
+    @patch('httpx.AsyncClient')
+    @patch('requests.Session.post')
+    def test_ollama_enqueue_report(self, mock_post, mock_async_client):
+        """
+        测试同一时间窗口内排队的请求合并为一个批次发送，单个请求则直接同步发送。
+        """
+        mock_post.return_value.content = json.dumps({"message": {"content": "single"}}).encode()
+        self.assertEqual(self.llm.enqueue_report(self.system_prompt, self.github_content).result(timeout=5), "single")
+        mock_post.assert_called_once()
+        mock_async_client.assert_not_called()
+
+        batch_response = MagicMock()
+        batch_response.content = json.dumps({"message": {"content": "batched"}}).encode()
+        client = mock_async_client.return_value
+        client.post = AsyncMock(return_value=batch_response)
+
+        # 使用新的实例，确保三个请求落在同一个时间窗口内
+        llm = LLM(self.config)
+        with patch('llm.BATCH_WINDOW_MS', 200):
+            futures = [llm.enqueue_report(self.system_prompt, content) for content in ("a", "bb" * 100, "ccc")]
+            results = [future.result(timeout=5) for future in futures]
+
+        self.assertEqual(results, ["batched"] * 3)
+        self.assertEqual(client.post.await_count, 3)
+        mock_post.assert_called_once()
+
+    @patch('requests.Session.post')
+    def test_enqueue_report_skips_cancelled_future(self, mock_post):
+        """
+        测试调用方取消排队中的请求后，该请求不会发送，后续请求仍能正常完成。
+        """
+        mock_post.return_value.content = json.dumps({"message": {"content": "report"}}).encode()
+
+        cancelled = self.llm.enqueue_report(self.system_prompt, "cancelled content")
+        self.assertTrue(cancelled.cancel())
+        future = self.llm.enqueue_report(self.system_prompt, self.github_content)
+
+        self.assertEqual(future.result(timeout=3), "report")
+        self.assertEqual(self.llm.enqueue_report(self.system_prompt, "later content").result(timeout=3), "report")
+        for call in mock_post.call_args_list:
+            self.assertNotIn(b"cancelled content", call.kwargs["data"])
+
+    def test_enqueue_report_does_not_wait_for_inflight_batch(self):
+        """
+        测试上一个批次仍在进行时，新到达的请求在下一个时间窗口内发出，不必等待该批次完成。
+        """
+        def fake_generate_report(system_prompt, user_content):
+            time.sleep(2 if user_content == "slow" else 0.05)
+            return user_content
+
+        with patch.object(self.llm, 'generate_report', side_effect=fake_generate_report):
+            slow = self.llm.enqueue_report(self.system_prompt, "slow")
+            time.sleep(0.2)
+            started = time.monotonic()
+            fast = self.llm.enqueue_report(self.system_prompt, "fast")
+
+            self.assertEqual(fast.result(timeout=3), "fast")
+            self.assertLess(time.monotonic() - started, 1)
+            self.assertFalse(slow.done())
+            self.assertEqual(slow.result(timeout=5), "slow")
+
+    @patch('requests.Session.post')
+    def test_input_exceeding_context_limit(self, mock_post):
+        """
+        测试输入超过模型上下文窗口时直接抛出错误，不发送请求。
+        """
+        self.config.context_limit = self.config.max_tokens + 100
+        self.llm = LLM(self.config)
+
+        with self.assertRaises(ValueError):
+            self.llm.generate_report(self.system_prompt, "token " * 1000)
+        mock_post.assert_not_called()
+
+    def test_context_limit_lookup(self):
+        """
+        测试上下文窗口按模型名称精确匹配（含日期后缀），不会把 gpt-4.1 等误判为 gpt-4。
+        """
+        self.config.llm_model_type = "openai"
+        self.config.context_limit = None
+        expected = {
+            "gpt-4": 8192,
+            "gpt-4-0613": 8192,
+            "gpt-4-32k": 32768,
+            "gpt-4.1": 1047576,
+            "gpt-4.1-mini": 1047576,
+            "gpt-4o-mini": 128000,
+            "gpt-4o-2024-08-06": 128000,
+            "gpt-4-turbo-preview": None,
+        }
+        for name, limit in expected.items():
+            self.config.openai_model_name = name
+            self.assertEqual(LLM(self.config)._context_limit(), limit, name)
+
+    @patch('requests.Session.post')
+    def test_ollama_context_limit_uses_num_ctx(self, mock_post):
+        """
+        测试 Ollama 按服务端 num_ctx 检查输入长度，并随请求发送相同的 num_ctx。
+        """
+        self.config.context_limit = None
+        self.config.ollama_model_name = "llama3.1:8b"
+        self.config.ollama_num_ctx = 8192
+        self.llm = LLM(self.config)
+        self.assertEqual(self.llm._context_limit(), 8192)
+
+        mock_post.return_value.content = json.dumps({"message": {"content": "report"}}).encode()
+        self.llm.generate_report(self.system_prompt, self.github_content)
+        _, kwargs = mock_post.call_args
+        self.assertEqual(json.loads(kwargs["data"])["options"]["num_ctx"], 8192)
+
+    @patch('requests.Session.post')
+    def test_ollama_report_cache(self, mock_post):
+        """
+        测试相同输入命中缓存时不再调用模型，切换模型后不会命中旧结果。
+        """
+        with tempfile.TemporaryDirectory() as cache_dir:
+            self.config.cache_enabled = True
+            self.config.cache_dir = cache_dir
+            self.llm = LLM(self.config)
+
+            mock_post.return_value.content = json.dumps({"message": {"content": "report"}}).encode()
+            self.assertEqual(self.llm.generate_report(self.system_prompt, self.github_content), "report")
+            self.assertEqual(self.llm.generate_report(self.system_prompt, self.github_content), "report")
+            self.assertEqual(mock_post.call_count, 1)
+
+            # 重新创建实例后仍能从磁盘缓存中读取
+            self.assertEqual(LLM(self.config).generate_report(self.system_prompt, self.github_content), "report")
+            self.assertEqual(mock_post.call_count, 1)
+
+            self.config.ollama_model_name = "another-model"
+            LLM(self.config).generate_report(self.system_prompt, self.github_content)
+            self.assertEqual(mock_post.call_count, 2)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,70 @@
+import sys
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+# 将 src 目录添加到模块搜索路径，方便导入项目中的模块
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from llm_cache import LLMCache  # 导入要测试的 LLMCache 类
+
+class TestLLMCache(unittest.TestCase):
+    def setUp(self):
+        """
+        在每个测试方法运行前执行，创建临时缓存目录。
+        """
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.cache_dir = self.tmp_dir.name
+
+    def test_concurrent_instances_keep_all_entries(self):
+        """
+        测试多个实例在不同线程中同时写入同一目录时，所有结果都保存到磁盘。
+        """
+        def write(worker):
+            cache = LLMCache(self.cache_dir)
+            for i in range(50):
+                cache.set(f"{worker}-{i}", f"report {worker}-{i}")
+
+        threads = [threading.Thread(target=write, args=(worker,)) for worker in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        reader = LLMCache(self.cache_dir)
+        for worker in range(4):
+            for i in range(50):
+                self.assertEqual(reader.get(f"{worker}-{i}"), f"report {worker}-{i}")
+
+    def test_disk_entries_are_limited(self):
+        """
+        测试磁盘结果数超过上限时删除最久未写入的结果。
+        """
+        cache = LLMCache(self.cache_dir, max_entries=3)
+        for i in range(5):
+            cache.set(f"key-{i}", f"report {i}")
+            path = os.path.join(self.cache_dir, f"key-{i}.json")
+            os.utime(path, (time.time() - 100 + i, time.time() - 100 + i))
+
+        self.assertEqual(len(os.listdir(self.cache_dir)), 3)
+        reader = LLMCache(self.cache_dir)
+        self.assertIsNone(reader.get("key-0"))
+        self.assertEqual(reader.get("key-4"), "report 4")
+
+    def test_expired_entries_are_ignored(self):
+        """
+        测试超过最长保留时间的磁盘结果视为未命中并被删除。
+        """
+        LLMCache(self.cache_dir).set("old", "stale report")
+        path = os.path.join(self.cache_dir, "old.json")
+        os.utime(path, (time.time() - 3600, time.time() - 3600))
+
+        self.assertIsNone(LLMCache(self.cache_dir, max_age=60).get("old"))
+        self.assertFalse(os.path.exists(path))
+
+
+if __name__ == '__main__':
+    unittest.main()
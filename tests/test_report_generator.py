@@ -164,5 +164,33 @@ class TestReportGenerator(unittest.TestCase):
         aggregated_content = self.report_generator._aggregate_topic_reports(self.test_hn_daily_dir_path)
         self.mock_llm.generate_report.assert_called_once_with(self.mock_prompts["hacker_news_daily_report"], aggregated_content)
 
+    @patch.object(ReportGenerator, '_preload_prompts', return_value=None)
+    def test_generate_github_reports(self, mock_preload_prompts):
+        """
+        测试 generate_github_reports 方法是否批量生成报告，并跳过生成失败的项目。
+        """
+        self.report_generator = ReportGenerator(self.mock_llm, ["github", "hacker_news_hours_topic", "hacker_news_daily_report"])
+        self.report_generator.prompts = self.mock_prompts
+
+        # 模拟 LLM 批量接口：第一个成功，第二个失败
+        mock_report = "This is a generated report."
+        self.mock_llm.generate_reports_batch.return_value = [mock_report, ValueError("boom")]
+
+        results = self.report_generator.generate_github_reports([self.test_markdown_file_path, self.test_hn_topic_file_path])
+
+        self.assertEqual(len(results), 2)
+        report, report_file_path = results[0]
+        self.assertEqual(report, mock_report)
+        self.assertTrue(report_file_path.endswith("_report.md"))
+        self.assertIsNone(results[1])
+
+        with open(report_file_path, 'r') as file:
+            self.assertEqual(file.read(), mock_report)
+
+        self.mock_llm.generate_reports_batch.assert_called_once_with([
+            (self.mock_prompts["github"], self.markdown_content),
+            (self.mock_prompts["github"], self.markdown_content),
+        ])
+
 if __name__ == '__main__':
     unittest.main()